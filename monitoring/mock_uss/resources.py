@@ -1,9 +1,54 @@
+import threading
+from typing import Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from monitoring.monitorlib import auth, infrastructure
 from monitoring.mock_uss import webapp
 from . import config
 
 
-utm_client = infrastructure.UTMClientSession(
-    webapp.config[config.KEY_DSS_URL],
-    auth.make_auth_adapter(webapp.config[config.KEY_AUTH_SPEC]),
-)
+_utm_client: Optional[infrastructure.UTMClientSession] = None
+_utm_client_lock = threading.Lock()
+
+
+def _make_utm_client() -> infrastructure.UTMClientSession:
+    utm_client = infrastructure.UTMClientSession(
+        webapp.config[config.KEY_DSS_URL],
+        auth.make_auth_adapter(webapp.config[config.KEY_AUTH_SPEC]),
+    )
+
+    # mock_uss talks to the DSS and to many other USSs, so pool connections to more
+    # hosts than the default 10; retry transient gateway errors with backoff, but
+    # only for safe methods since a PUT/DELETE may have taken effect upstream even
+    # though the gateway failed (retrying would then produce a misleading conflict)
+    adapter = HTTPAdapter(
+        pool_connections=64,
+        pool_maxsize=64,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            raise_on_status=False,
+        ),
+    )
+    utm_client.mount("https://", adapter)
+    utm_client.mount("http://", adapter)
+    return utm_client
+
+
+def get_utm_client() -> infrastructure.UTMClientSession:
+    """Get the session used to communicate with the DSS and other USSs.
+
+    The session (including its auth adapter) is created on first use rather
+    than at import time so that processes which never make UTM requests don't
+    pay for it.
+    """
+    global _utm_client
+    if _utm_client is None:
+        with _utm_client_lock:
+            if _utm_client is None:
+                _utm_client = _make_utm_client()
+    return _utm_client
@@ -96,7 +96,9 @@ def riddp_display_data() -> Tuple[str, int]:
 
     # Get ISAs in the DSS
     t = arrow.utcnow().datetime
-    isas_response: fetch.FetchedISAs = fetch.isas(resources.utm_client, view, t, t)
+    isas_response: fetch.FetchedISAs = fetch.isas(
+        resources.get_utm_client(), view, t, t
+    )
     if not isas_response.success:
         response = rid.ErrorResponse(message="Unable to fetch ISAs from DSS")
         response["errors"] = [isas_response]
@@ -111,7 +113,9 @@ def riddp_display_data() -> Tuple[str, int]:
     for flights_url, uss in isas_response.flight_urls.items():
         if uss in behavior.do_not_display_flights_from:
             continue
-        flights_response = fetch.flights(resources.utm_client, flights_url, view, True)
+        flights_response = fetch.flights(
+            resources.get_utm_client(), flights_url, view, True
+        )
         if not flights_response.success:
             response = rid.ErrorResponse(
                 message="Error querying {} from {}".format(flights_url, uss)
@@ -48,7 +48,7 @@ def ridsp_create_test(test_id: str) -> Tuple[str, int]:
         webapp.config.get(config.KEY_BASE_URL)
     )
     mutated_isa = mutate.put_isa(
-        resources.utm_client, rect, t0, t1, flights_url, record.version
+        resources.get_utm_client(), rect, t0, t1, flights_url, record.version
     )
     if not mutated_isa.dss_response.success:
         response = rid.ErrorResponse(message="Unable to create ISA in DSS")
@@ -79,7 +79,7 @@ def ridsp_delete_test(test_id: str) -> Tuple[str, int]:
 
     # Delete ISA from DSS
     deleted_isa = mutate.delete_isa(
-        resources.utm_client, record.version, record.isa_version
+        resources.get_utm_client(), record.version, record.isa_version
     )
     if not deleted_isa.dss_response.success:
         response = rid.ErrorResponse(message="Unable to delete ISA from DSS")
@@ -42,7 +42,7 @@ def query_operational_intents(
     :return: Full definition for every operational intent discovered
     """
     op_intent_refs = scd_client.query_operational_intent_references(
-        resources.utm_client, area_of_interest
+        resources.get_utm_client(), area_of_interest
     )
     tx = db.value
     get_details_for = []
@@ -58,7 +58,7 @@ def query_operational_intents(
     for op_intent_ref in get_details_for:
         updated_op_intents.append(
             scd_client.get_operational_intent_details(
-                resources.utm_client, op_intent_ref.uss_base_url, op_intent_ref.id
+                resources.get_utm_client(), op_intent_ref.uss_base_url, op_intent_ref.id
             )
         )
 
@@ -245,7 +245,7 @@ def inject_flight(flight_id: str, req_body: InjectFlightRequest) -> Tuple[dict,
             if existing_flight:
                 id = existing_flight.op_intent_reference.id
                 result = scd_client.update_operational_intent_reference(
-                    resources.utm_client,
+                    resources.get_utm_client(),
                     id,
                     existing_flight.op_intent_reference.ovn,
                     req,
@@ -253,7 +253,7 @@ def inject_flight(flight_id: str, req_body: InjectFlightRequest) -> Tuple[dict,
             else:
                 id = str(uuid.uuid4())
                 result = scd_client.create_operational_intent_reference(
-                    resources.utm_client, id, req
+                    resources.get_utm_client(), id, req
                 )
         except (
             ValueError,
@@ -271,7 +271,7 @@ def inject_flight(flight_id: str, req_body: InjectFlightRequest) -> Tuple[dict,
             f"[inject_flight:{flight_id}] Notifying subscribers {', '.join(s.uss_base_url for s in result.subscribers)}"
         )
         scd_client.notify_subscribers(
-            resources.utm_client,
+            resources.get_utm_client(),
             result.operational_intent_reference.id,
             scd.OperationalIntent(
                 reference=result.operational_intent_reference,
@@ -355,7 +355,7 @@ def delete_flight(flight_id) -> Tuple[dict, int]:
     # Delete operational intent from DSS
     try:
         result = scd_client.delete_operational_intent_reference(
-            resources.utm_client,
+            resources.get_utm_client(),
             flight.op_intent_reference.id,
             flight.op_intent_reference.ovn,
         )
@@ -371,7 +371,7 @@ def delete_flight(flight_id) -> Tuple[dict, int]:
             200,
         )
     scd_client.notify_subscribers(
-        resources.utm_client,
+        resources.get_utm_client(),
         result.operational_intent_reference.id,
         None,
         result.subscribers,
@@ -406,7 +406,7 @@ def clear_area(req: ClearAreaRequest) -> Tuple[dict, int]:
     )
     try:
         op_intent_refs = scd_client.query_operational_intent_references(
-            resources.utm_client, vol4
+            resources.get_utm_client(), vol4
         )
     except (
         ValueError,
@@ -433,7 +433,7 @@ def clear_area(req: ClearAreaRequest) -> Tuple[dict, int]:
     for op_intent_ref in op_intent_refs:
         try:
             scd_client.delete_operational_intent_reference(
-                resources.utm_client, op_intent_ref.id, op_intent_ref.ovn
+                resources.get_utm_client(), op_intent_ref.id, op_intent_ref.ovn
             )
             dss_deletion_results[op_intent_ref.id] = "Deleted from DSS"
             deleted.add(op_intent_ref.id)
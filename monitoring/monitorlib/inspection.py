@@ -1,3 +1,4 @@
+import functools
 import importlib
 import pkgutil
 from typing import Type
@@ -29,6 +30,7 @@ def get_module_object_by_name(parent_module, object_name: str):
     return module_object
 
 
+@functools.lru_cache(maxsize=None)
 def fullname(class_type: Type) -> str:
     module = class_type.__module__
     if module == "builtins":
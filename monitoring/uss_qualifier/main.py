@@ -6,6 +6,7 @@ import os
 import sys
 
 from implicitdict import ImplicitDict
+from loguru import logger
 from monitoring.monitorlib.versioning import get_code_version
 from monitoring.uss_qualifier.configurations.configuration import (
     TestConfiguration,
@@ -54,6 +55,11 @@ def execute_test_run(config: TestConfiguration):
 def main() -> int:
     args = parseArgs()
 
+    # Write log messages from a background thread so that logging (e.g., of each
+    # query recorded by a test scenario) does not block test execution on I/O
+    logger.remove()
+    logger.add(sys.stderr, enqueue=True)
+
     config = USSQualifierConfiguration.from_string(args.config).v1
     if args.report:
         if not config.artifacts:
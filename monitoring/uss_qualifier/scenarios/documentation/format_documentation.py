@@ -1,7 +1,6 @@
 import os
 import sys
 
-from monitoring.monitorlib import inspection
 from monitoring.uss_qualifier import scenarios
 from monitoring.uss_qualifier.scenarios.documentation.autoformat import (
     format_scenario_documentation,
@@ -10,7 +9,6 @@ from monitoring.uss_qualifier.scenarios.scenario import find_test_scenarios
 
 
 def main() -> int:
-    inspection.import_submodules(scenarios)
     test_scenarios = find_test_scenarios(scenarios)
     changes = format_scenario_documentation(list(test_scenarios))
     for filename, content in changes.items():
@@ -1,3 +1,4 @@
+import functools
 import inspect
 import os
 from typing import List, Dict, Type
@@ -248,11 +249,9 @@ def _parse_documentation(scenario: Type) -> TestScenarioDocumentation:
     return TestScenarioDocumentation(**kwargs)
 
 
+@functools.lru_cache(maxsize=None)
 def get_documentation(scenario: Type) -> TestScenarioDocumentation:
-    DOC_CACHE_ATTRIBUTE = "_md_documentation"
-    if not hasattr(scenario, DOC_CACHE_ATTRIBUTE):
-        setattr(scenario, DOC_CACHE_ATTRIBUTE, _parse_documentation(scenario))
-    return getattr(scenario, DOC_CACHE_ATTRIBUTE)
+    return _parse_documentation(scenario)
 
 
 def get_documentation_by_name(scenario_type_name: str) -> TestScenarioDocumentation:
@@ -1,7 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 import traceback
 from datetime import datetime
 from typing import List, Dict, Union, Optional, Tuple, Iterable
 
+from monitoring.monitorlib import fetch
 from monitoring.monitorlib.scd import bounding_vol4
 from monitoring.monitorlib.scd_automated_testing.scd_injection_api import (
     InjectFlightRequest,
@@ -9,6 +11,7 @@ from monitoring.monitorlib.scd_automated_testing.scd_injection_api import (
     InjectFlightResult,
     InjectFlightResponse,
     DeleteFlightResult,
+    DeleteFlightResponse,
 )
 from monitoring.uss_qualifier.common_data_definitions import Severity
 from monitoring.uss_qualifier.resources.flight_planning.flight_planner import (
@@ -37,20 +40,33 @@ def clear_area(
         volumes += flight_intent.operational_intent.volumes
         volumes += flight_intent.operational_intent.off_nominal_volumes
     extent = bounding_vol4(volumes)
-    for uss in flight_planners:
+
+    # Clearing requests to different USSs are independent, so issue them all
+    # concurrently and then evaluate their outcomes in order
+    with ThreadPoolExecutor(max_workers=max(len(flight_planners), 1)) as executor:
+        clearings = [executor.submit(uss.clear_area, extent) for uss in flight_planners]
+
+    # Every clearing request has been sent, so record all their queries before
+    # any check below can abort the scenario
+    for clearing in clearings:
+        e = clearing.exception()
+        if e is None:
+            scenario.record_query(clearing.result()[1])
+        elif isinstance(e, QueryError):
+            for q in e.queries:
+                scenario.record_query(q)
+
+    for uss, clearing in zip(flight_planners, clearings):
         with scenario.check("Area cleared successfully", [uss.participant_id]) as check:
             try:
-                resp, query = uss.clear_area(extent)
+                resp, query = clearing.result()
             except QueryError as e:
-                for q in e.queries:
-                    scenario.record_query(q)
                 check.record_failed(
                     summary=f"Error from {uss.participant_id} when attempting to clear area",
                     severity=Severity.High,
                     details=f"{str(e)}\n\nStack trace:\n{e.stacktrace}",
                     query_timestamps=[q.request.timestamp for q in e.queries],
                 )
-            scenario.record_query(query)
             if not resp.outcome.success:
                 check.record_failed(
                     summary="Area could not be cleared",
@@ -314,42 +330,82 @@ def activate_valid_flight_intent(
     return resp
 
 
+_DeletionOutcome = Union[Tuple[DeleteFlightResponse, fetch.Query], Exception]
+
+
+def _delete_flights(
+    flight_planner: FlightPlanner,
+) -> List[Tuple[str, _DeletionOutcome]]:
+    """Delete each flight created by `flight_planner`, one after another.
+
+    :return: Result of, or exception raised by, each attempted deletion, in order.  Any exception other than a QueryError ends the sequence.
+    """
+    outcomes = []
+    for flight_id in flight_planner.created_flight_ids.copy():
+        try:
+            outcomes.append((flight_id, flight_planner.cleanup_flight(flight_id)))
+        except QueryError as e:
+            outcomes.append((flight_id, e))
+        except Exception as e:
+            outcomes.append((flight_id, e))
+            break
+    return outcomes
+
+
 def cleanup_flights(
     scenario: TestScenarioType, flight_planners: Iterable[FlightPlanner]
 ) -> None:
     """Remove flights during a cleanup test step.
 
+    Flights are deleted from each flight planner in sequence, but flight
+    planners are cleaned up concurrently, so deletions are not ordered across
+    flight planners.  Outcomes are recorded in the order of `flight_planners`.
+
     This function assumes:
     * `scenario` is currently cleaning up (cleanup has started)
     * "Successful flight deletion" check declared for cleanup phase in `scenario`'s documentation
     """
-    for flight_planner in flight_planners:
-        removed = []
-        to_remove = flight_planner.created_flight_ids.copy()
-        for flight_id in to_remove:
-            with scenario.check(
-                "Successful flight deletion", [flight_planner.participant_id]
-            ) as check:
-                try:
-                    resp, query = flight_planner.cleanup_flight(flight_id)
-                    scenario.record_query(query)
-                except QueryError as e:
-                    for q in e.queries:
-                        scenario.record_query(q)
-                    check.record_failed(
-                        summary=f"Failed to clean up flight {flight_id} from {flight_planner.participant_id}",
-                        severity=Severity.Medium,
-                        details=f"{str(e)}\n\nStack trace:\n{e.stacktrace}",
-                        query_timestamps=[q.request.timestamp for q in e.queries],
-                    )
-                    continue
-
-                if resp.result == DeleteFlightResult.Closed:
-                    removed.append(flight_id)
-                else:
-                    check.record_failed(
-                        summary="Failed to delete flight",
-                        details=f"USS indicated: {resp.notes}",
-                        severity=Severity.Medium,
-                        query_timestamps=[query.request.timestamp],
-                    )
+    flight_planners = list(flight_planners)
+    with ThreadPoolExecutor(max_workers=max(len(flight_planners), 1)) as executor:
+        jobs = [
+            executor.submit(_delete_flights, flight_planner)
+            for flight_planner in flight_planners
+        ]
+    deletions = [
+        (flight_planner, flight_id, outcome)
+        for flight_planner, job in zip(flight_planners, jobs)
+        for flight_id, outcome in job.result()
+    ]
+
+    # Every deletion request has been sent, so record all their queries before
+    # any outcome below can abort cleanup
+    for _, _, outcome in deletions:
+        if isinstance(outcome, QueryError):
+            for q in outcome.queries:
+                scenario.record_query(q)
+        elif not isinstance(outcome, Exception):
+            scenario.record_query(outcome[1])
+
+    for flight_planner, flight_id, outcome in deletions:
+        with scenario.check(
+            "Successful flight deletion", [flight_planner.participant_id]
+        ) as check:
+            if isinstance(outcome, QueryError):
+                check.record_failed(
+                    summary=f"Failed to clean up flight {flight_id} from {flight_planner.participant_id}",
+                    severity=Severity.Medium,
+                    details=f"{str(outcome)}\n\nStack trace:\n{outcome.stacktrace}",
+                    query_timestamps=[q.request.timestamp for q in outcome.queries],
+                )
+                continue
+            elif isinstance(outcome, Exception):
+                raise outcome
+            resp, query = outcome
+
+            if resp.result != DeleteFlightResult.Closed:
+                check.record_failed(
+                    summary="Failed to delete flight",
+                    details=f"USS indicated: {resp.notes}",
+                    severity=Severity.Medium,
+                    query_timestamps=[query.request.timestamp],
+                )
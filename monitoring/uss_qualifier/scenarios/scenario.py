@@ -1,12 +1,24 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from enum import Enum
+from enum import IntFlag
+from collections import deque
+import functools
 import inspect
-from typing import Callable, Dict, List, Optional, TypeVar, Union, Set
-
-import arrow
+import sys
+from typing import (
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Set,
+)
 
 from implicitdict import StringBasedDateTime
+from loguru import logger
 
 from monitoring import uss_qualifier as uss_qualifier_module
 from monitoring.monitorlib import fetch, inspection
@@ -44,23 +56,55 @@ class TestRunCannotContinueError(Exception):
         super(TestRunCannotContinueError, self).__init__(msg)
 
 
-class ScenarioPhase(str, Enum):
-    Undefined = "Undefined"
-    NotStarted = "NotStarted"
-    ReadyForTestCase = "ReadyForTestCase"
-    ReadyForTestStep = "ReadyForTestStep"
-    RunningTestStep = "RunningTestStep"
-    ReadyForCleanup = "ReadyForCleanup"
-    CleaningUp = "CleaningUp"
-    Complete = "Complete"
+class ScenarioPhase(IntFlag):
+    Undefined = 1
+    NotStarted = 2
+    ReadyForTestCase = 4
+    ReadyForTestStep = 8
+    RunningTestStep = 16
+    ReadyForCleanup = 32
+    CleaningUp = 64
+    Complete = 128
+
+
+_RECORDING_PHASES = ScenarioPhase.RunningTestStep | ScenarioPhase.CleaningUp
+"""Phases in which checks may be performed and queries recorded."""
+
+_IN_PROGRESS_PHASES = (
+    ScenarioPhase.NotStarted
+    | ScenarioPhase.ReadyForTestCase
+    | ScenarioPhase.ReadyForTestStep
+    | ScenarioPhase.RunningTestStep
+    | ScenarioPhase.ReadyForCleanup
+    | ScenarioPhase.CleaningUp
+)
+"""Phases in which notes may be recorded."""
+
+_CLEANUP_ENTRY_PHASES = (
+    ScenarioPhase.ReadyForTestCase
+    | ScenarioPhase.ReadyForTestStep
+    | ScenarioPhase.RunningTestStep
+    | ScenarioPhase.ReadyForCleanup
+)
+"""Phases from which the scenario may go to cleanup."""
 
 
 class PendingCheck(object):
+    __slots__ = (
+        "_documentation",
+        "_failed_checks",
+        "_passed_checks",
+        "_on_failed_check",
+        "_participants",
+        "_outcome_recorded",
+    )
+
     _documentation: TestCheckDocumentation
-    _step_report: TestStepReport
+    _failed_checks: List[FailedCheck]
+    _passed_checks: List[PassedCheck]
     _on_failed_check: Optional[Callable[[FailedCheck], None]]
     _participants: List[ParticipantID]
-    _outcome_recorded: bool = False
+    _outcome_recorded: bool
 
     def __init__(
         self,
@@ -71,8 +115,10 @@ class PendingCheck(object):
     ):
         self._documentation = documentation
         self._participants = participants
-        self._step_report = step_report
+        self._failed_checks = step_report.failed_checks
+        self._passed_checks = step_report.passed_checks
         self._on_failed_check = on_failed_check
+        self._outcome_recorded = False
 
     def __enter__(self):
         return self
@@ -97,24 +143,22 @@ class PendingCheck(object):
         if requirements is None:
             requirements = self._documentation.applicable_requirements
 
-        kwargs = {
-            "name": self._documentation.name,
-            "documentation_url": self._documentation.url,
-            "timestamp": StringBasedDateTime(datetime.utcnow()),
-            "summary": summary,
-            "details": details,
-            "requirements": requirements,
-            "severity": severity,
-            "participants": participants,
-        }
-        if additional_data is not None:
-            kwargs["additional_data"] = additional_data
-        if query_timestamps is not None:
-            kwargs["query_report_timestamps"] = [
-                StringBasedDateTime(t) for t in query_timestamps
-            ]
-        failed_check = FailedCheck(**kwargs)
-        self._step_report.failed_checks.append(failed_check)
+        # Optional fields explicitly set to None are omitted by ImplicitDict
+        failed_check = FailedCheck(
+            name=self._documentation.name,
+            documentation_url=self._documentation.url,
+            timestamp=StringBasedDateTime(datetime.utcnow()),
+            summary=summary,
+            details=details,
+            requirements=requirements,
+            severity=severity,
+            participants=participants,
+            query_report_timestamps=None
+            if query_timestamps is None
+            else [StringBasedDateTime(t) for t in query_timestamps],
+            additional_data=additional_data,
+        )
+        self._failed_checks.append(failed_check)
         if self._on_failed_check is not None:
             self._on_failed_check(failed_check)
         if severity == Severity.High:
@@ -138,7 +182,23 @@ class PendingCheck(object):
             participants=participants,
             requirements=requirements,
         )
-        self._step_report.passed_checks.append(passed_check)
+        self._passed_checks.append(passed_check)
+
+
+class _ScenarioPlan(NamedTuple):
+    """Documentation of a test scenario type, indexed by name."""
+
+    cases: Dict[str, TestCaseDocumentation]
+    """Test cases by test case name"""
+
+    steps: Dict[str, Dict[str, TestStepDocumentation]]
+    """Test steps by test step name, by test case name"""
+
+    checks: Dict[Tuple[str, str], Dict[str, TestCheckDocumentation]]
+    """Checks by check name, by (test case name, test step name)"""
+
+    cleanup_checks: Optional[Dict[str, TestCheckDocumentation]]
+    """Checks in the cleanup step by check name, or None if there is no cleanup step"""
 
 
 class TestScenario(ABC):
@@ -154,36 +214,52 @@ class TestScenario(ABC):
     on_failed_check: Optional[Callable[[FailedCheck], None]] = None
     _phase: ScenarioPhase = ScenarioPhase.Undefined
     _scenario_report: Optional[TestScenarioReport] = None
+    _case_names_seen: Set[str]
     _current_case: Optional[TestCaseDocumentation] = None
     _case_report: Optional[TestCaseReport] = None
     _current_step: Optional[TestStepDocumentation] = None
+    _current_step_checks: Optional[Dict[str, TestCheckDocumentation]] = None
     _step_report: Optional[TestStepReport] = None
+    _step_queries: Optional[List[fetch.Query]] = None
+    _plan: _ScenarioPlan
+    _any_non_low_failure: bool
 
     def __init__(self):
         self.documentation = get_documentation(self.__class__)
+        self._plan = self._compile_plan()
+        self._any_non_low_failure = False
         self._phase = ScenarioPhase.NotStarted
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _compile_plan(cls) -> _ScenarioPlan:
+        documentation = get_documentation(cls)
+        cleanup_checks = None
+        if "cleanup" in documentation and documentation.cleanup is not None:
+            cleanup_checks = {c.name: c for c in documentation.cleanup.checks}
+        return _ScenarioPlan(
+            cases={case.name: case for case in documentation.cases},
+            steps={
+                case.name: {step.name: step for step in case.steps}
+                for case in documentation.cases
+            },
+            checks={
+                (case.name, step.name): {check.name: check for check in step.checks}
+                for case in documentation.cases
+                for step in case.steps
+            },
+            cleanup_checks=cleanup_checks,
+        )
+
     @staticmethod
     def make_test_scenario(
         declaration: TestScenarioDeclaration,
         resource_pool: Dict[ResourceID, ResourceTypeName],
     ) -> "TestScenario":
-        inspection.import_submodules(scenarios_module)
-        scenario_type = inspection.get_module_object_by_name(
-            parent_module=uss_qualifier_module, object_name=declaration.scenario_type
-        )
-        if not issubclass(scenario_type, TestScenario):
-            raise NotImplementedError(
-                "Scenario type {} is not a subclass of the TestScenario base class".format(
-                    scenario_type.__name__
-                )
-            )
+        scenario_type = _get_scenario_type(declaration.scenario_type)
 
-        constructor_signature = inspect.signature(scenario_type.__init__)
         constructor_args = {}
-        for arg_name, arg in constructor_signature.parameters.items():
-            if arg_name == "self":
-                continue
+        for arg_name in _get_constructor_parameter_names(scenario_type):
             if arg_name not in resource_pool:
                 available_pool = ", ".join(resource_pool)
                 raise ValueError(
@@ -215,36 +291,28 @@ class TestScenario(ABC):
             documentation_url=self.documentation.url,
             start_time=StringBasedDateTime(datetime.utcnow()),
             cases=[],
+            notes={},
         )
-
-    def _expect_phase(self, expected_phase: Union[ScenarioPhase, Set[ScenarioPhase]]):
-        if isinstance(expected_phase, ScenarioPhase):
-            expected_phase = {expected_phase}
-        if self._phase not in expected_phase:
-            caller = inspect.stack()[1].function
-            acceptable_phases = ", ".join(expected_phase)
+        self._case_names_seen = set()
+
+    def _expect_phase(self, expected_phases: ScenarioPhase):
+        """Raise unless the current phase is one of `expected_phases` (a bitwise OR of ScenarioPhases)."""
+        if not (self._phase & expected_phases):
+            caller = sys._getframe(1).f_code.co_name
+            acceptable_phases = ", ".join(
+                p.name for p in ScenarioPhase if p & expected_phases
+            )
             raise RuntimeError(
-                f"Test scenario `{self.me()}` was {self._phase} when {caller} was called (expected {acceptable_phases})"
+                f"Test scenario `{self.me()}` was {self._phase.name} when {caller} was called (expected {acceptable_phases})"
             )
 
     def record_note(self, key: str, message: str) -> None:
-        self._expect_phase(
-            {
-                ScenarioPhase.NotStarted,
-                ScenarioPhase.ReadyForTestCase,
-                ScenarioPhase.ReadyForTestStep,
-                ScenarioPhase.RunningTestStep,
-                ScenarioPhase.ReadyForCleanup,
-                ScenarioPhase.CleaningUp,
-            }
-        )
-        if "notes" not in self._scenario_report:
-            self._scenario_report.notes = {}
+        self._expect_phase(_IN_PROGRESS_PHASES)
         self._scenario_report.notes[key] = Note(
             message=message,
-            timestamp=StringBasedDateTime(arrow.utcnow().datetime),
+            timestamp=StringBasedDateTime(datetime.utcnow()),
         )
-        print(f"Note: {key} -> {message}")
+        logger.debug(f"Note: {key} -> {message}")
 
     def begin_test_scenario(self) -> None:
         self._expect_phase(ScenarioPhase.NotStarted)
@@ -253,17 +321,16 @@ class TestScenario(ABC):
 
     def begin_test_case(self, name: str) -> None:
         self._expect_phase(ScenarioPhase.ReadyForTestCase)
-        available_cases = {c.name: c for c in self.documentation.cases}
-        if name not in available_cases:
-            case_list = ", ".join(f'"{c}"' for c in available_cases)
+        if name not in self._plan.cases:
+            case_list = ", ".join(f'"{c}"' for c in self._plan.cases)
             raise RuntimeError(
                 f'Test scenario `{self.me()}` was instructed to begin_test_case "{name}", but that test case is not declared in documentation; declared cases are: {case_list}'
             )
-        if name in [c.name for c in self._scenario_report.cases]:
+        if name in self._case_names_seen:
             raise RuntimeError(
                 f"Test case {name} had already run in `{self.me()}` when begin_test_case was called"
             )
-        self._current_case = available_cases[name]
+        self._current_case = self._plan.cases[name]
         self._case_report = TestCaseReport(
             name=self._current_case.name,
             documentation_url=self._current_case.url,
@@ -271,38 +338,42 @@ class TestScenario(ABC):
             steps=[],
         )
         self._scenario_report.cases.append(self._case_report)
+        self._case_names_seen.add(name)
         self._phase = ScenarioPhase.ReadyForTestStep
 
     def begin_test_step(self, name: str) -> None:
         self._expect_phase(ScenarioPhase.ReadyForTestStep)
-        available_steps = {c.name: c for c in self._current_case.steps}
+        available_steps = self._plan.steps[self._current_case.name]
         if name not in available_steps:
             step_list = ", ".join(f'"{s}"' for s in available_steps)
             raise RuntimeError(
                 f'Test scenario `{self.me()}` was instructed to begin_test_step "{name}" during test case "{self._current_case.name}", but that test step is not declared in documentation; declared steps are: {step_list}'
             )
         self._current_step = available_steps[name]
+        self._current_step_checks = self._plan.checks[
+            (self._current_case.name, self._current_step.name)
+        ]
         self._step_report = TestStepReport(
             name=self._current_step.name,
             documentation_url=self._current_step.url,
             start_time=StringBasedDateTime(datetime.utcnow()),
+            queries=[],
             failed_checks=[],
             passed_checks=[],
         )
+        self._step_queries = self._step_report.queries
         self._case_report.steps.append(self._step_report)
         self._phase = ScenarioPhase.RunningTestStep
 
     def record_query(self, query: fetch.Query) -> None:
-        self._expect_phase({ScenarioPhase.RunningTestStep, ScenarioPhase.CleaningUp})
-        if "queries" not in self._step_report:
-            self._step_report.queries = []
-        self._step_report.queries.append(query)
-        print(
+        self._expect_phase(_RECORDING_PHASES)
+        self._step_queries.append(query)
+        logger.debug(
             f"Queried {query.request['method']} {query.request['url']} -> {query.response.status_code}"
         )
 
     def _get_check(self, name: str) -> TestCheckDocumentation:
-        available_checks = {c.name: c for c in self._current_step.checks}
+        available_checks = self._current_step_checks
         if name not in available_checks:
             check_list = ", ".join(f'"{c}"' for c in available_checks)
             raise RuntimeError(
@@ -313,8 +384,8 @@ class TestScenario(ABC):
     def check(
         self, name: str, participants: Optional[List[ParticipantID]] = None
     ) -> PendingCheck:
-        self._expect_phase({ScenarioPhase.RunningTestStep, ScenarioPhase.CleaningUp})
-        available_checks = {c.name: c for c in self._current_step.checks}
+        self._expect_phase(_RECORDING_PHASES)
+        available_checks = self._current_step_checks
         if name not in available_checks:
             check_list = ", ".join(available_checks)
             raise RuntimeError(
@@ -325,14 +396,22 @@ class TestScenario(ABC):
             documentation=check_documentation,
             participants=[] if participants is None else participants,
             step_report=self._step_report,
-            on_failed_check=self.on_failed_check,
+            on_failed_check=self._handle_failed_check,
         )
 
+    def _handle_failed_check(self, failed_check: FailedCheck) -> None:
+        if failed_check.severity != Severity.Low:
+            self._any_non_low_failure = True
+        if self.on_failed_check is not None:
+            self.on_failed_check(failed_check)
+
     def end_test_step(self) -> None:
         self._expect_phase(ScenarioPhase.RunningTestStep)
         self._step_report.end_time = StringBasedDateTime(datetime.utcnow())
         self._current_step = None
+        self._current_step_checks = None
         self._step_report = None
+        self._step_queries = None
         self._phase = ScenarioPhase.ReadyForTestStep
 
     def end_test_case(self) -> None:
@@ -348,14 +427,7 @@ class TestScenario(ABC):
         self._phase = ScenarioPhase.ReadyForCleanup
 
     def go_to_cleanup(self) -> None:
-        self._expect_phase(
-            {
-                ScenarioPhase.ReadyForTestCase,
-                ScenarioPhase.ReadyForTestStep,
-                ScenarioPhase.RunningTestStep,
-                ScenarioPhase.ReadyForCleanup,
-            }
-        )
+        self._expect_phase(_CLEANUP_ENTRY_PHASES)
         self._phase = ScenarioPhase.ReadyForCleanup
 
     def begin_cleanup(self) -> None:
@@ -365,13 +437,16 @@ class TestScenario(ABC):
                 f"Test scenario `{self.me()}` attempted to begin_cleanup, but no cleanup step is documented"
             )
         self._current_step = self.documentation.cleanup
+        self._current_step_checks = self._plan.cleanup_checks
         self._step_report = TestStepReport(
             name=self._current_step.name,
             documentation_url=self._current_step.url,
             start_time=StringBasedDateTime(datetime.utcnow()),
+            queries=[],
             failed_checks=[],
             passed_checks=[],
         )
+        self._step_queries = self._step_report.queries
         self._scenario_report.cleanup = self._step_report
         self._phase = ScenarioPhase.CleaningUp
 
@@ -411,16 +486,8 @@ class TestScenario(ABC):
         # Evaluate success
         self._scenario_report.successful = (
             "execution_error" not in self._scenario_report
+            and not self._any_non_low_failure
         )
-        for case_report in self._scenario_report.cases:
-            for step_report in case_report.steps:
-                for failed_check in step_report.failed_checks:
-                    if failed_check.severity != Severity.Low:
-                        self._scenario_report.successful = False
-        if "cleanup" in self._scenario_report:
-            for failed_check in self._scenario_report.cleanup.failed_checks:
-                if failed_check.severity != Severity.Low:
-                    self._scenario_report.successful = False
 
         return self._scenario_report
 
@@ -428,27 +495,59 @@ class TestScenario(ABC):
 TestScenarioType = TypeVar("TestScenarioType", bound=TestScenario)
 
 
-def find_test_scenarios(
-    module, already_checked: Optional[Set[str]] = None
-) -> List[TestScenarioType]:
-    if already_checked is None:
-        already_checked = set()
-    already_checked.add(module.__name__)
-    test_scenarios = set()
-    for name, member in inspect.getmembers(module):
-        if (
-            inspect.ismodule(member)
-            and member.__name__ not in already_checked
-            and member.__name__.startswith("monitoring.uss_qualifier.scenarios")
-        ):
-            descendants = find_test_scenarios(member, already_checked)
-            for descendant in descendants:
-                if descendant not in test_scenarios:
-                    test_scenarios.add(descendant)
-        elif inspect.isclass(member) and member is not TestScenario:
-            if issubclass(member, TestScenario):
-                if member not in test_scenarios:
-                    test_scenarios.add(member)
-    result = list(test_scenarios)
-    result.sort(key=lambda s: fullname(s))
-    return result
+_scenario_types: Dict[str, Type[TestScenario]] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _import_submodules_once(module) -> None:
+    inspection.import_submodules(module)
+
+
+def _get_scenario_type(scenario_type_name: str) -> Type[TestScenario]:
+    if scenario_type_name not in _scenario_types:
+        _import_submodules_once(scenarios_module)
+        scenario_type = inspection.get_module_object_by_name(
+            parent_module=uss_qualifier_module, object_name=scenario_type_name
+        )
+        if not issubclass(scenario_type, TestScenario):
+            raise NotImplementedError(
+                "Scenario type {} is not a subclass of the TestScenario base class".format(
+                    scenario_type.__name__
+                )
+            )
+        _scenario_types[scenario_type_name] = scenario_type
+    return _scenario_types[scenario_type_name]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_constructor_parameter_names(
+    scenario_type: Type[TestScenario],
+) -> Tuple[str, ...]:
+    return tuple(
+        arg_name
+        for arg_name in inspect.signature(scenario_type.__init__).parameters
+        if arg_name != "self"
+    )
+
+
+def find_test_scenarios(module) -> List[TestScenarioType]:
+    """Find all TestScenario subclasses defined in `module` or its descendants.
+
+    :param module: Package in which to look for test scenarios.
+    :return: Test scenario types, sorted by full name.
+    """
+    _import_submodules_once(module)
+    prefix = module.__name__
+    test_scenarios = []
+    to_visit = deque(TestScenario.__subclasses__())
+    seen = set(to_visit)
+    while to_visit:
+        test_scenario = to_visit.popleft()
+        if test_scenario.__module__.startswith(prefix):
+            test_scenarios.append(test_scenario)
+        for subclass in test_scenario.__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                to_visit.append(subclass)
+    test_scenarios.sort(key=fullname)
+    return test_scenarios